@@ -1,29 +1,79 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+import mmap
 from pathlib import Path
 import os
 import re
+import string
+import sys
+import tempfile
 from loguru import logger
 
+try:
+    import orjson  # Optional: parses in native code; falls back to the stdlib json module
+except ImportError:
+    orjson = None
+
 # CONFIG_FILE = Path("../config.json").resolve() # Assuming main.py is in src/
 CONFIG_FILE = Path(__file__).resolve().parent.parent / "config.json"
-
+MAX_READ_WORKERS = 32
+MMAP_MIN_SIZE = 64 * 1024  # Index files at least this large are scanned via mmap instead of copied into memory
+TEMP_INDEX_FILENAME = "temp index.md"
+STATE_DIR = Path.home() / ".cache" / "zk_indexer"
+TAG_STATE_FILE = STATE_DIR / "tag_state.json"  # {tag: {large index file path: [st_mtime_ns, st_size] when last verified}}
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+# bytes.translate table mapping every byte outside [a-z0-9] to a space, for the pure-ASCII normalization path
+_ASCII_NON_ALNUM_TO_SPACE = bytes(
+    c if chr(c) in string.ascii_lowercase + string.digits else ord(' ') for c in range(256)
+)
+# Captures the target inside [[wikilink]] brackets; bytes, so raw file contents are scanned without decoding them first
+_WIKILINK_RE_BYTES = re.compile(rb'\[\[([^\]]+)\]\]')
+# A line holding nothing but one [[wikilink]], matched on raw bytes; [^\S\n] is whitespace other than newline
+_UNINDEXED_LINE_RE = re.compile(rb'^[^\S\n]*\[\[[^\S\n]*([^\]\n]+?)[^\S\n]*\]\][^\S\n]*$', re.MULTILINE)
+# YAML frontmatter: a '---' first line through the next '---' line; [^\S\n] is whitespace other than newline
+_FRONTMATTER_RE = re.compile(rb'[^\S\n]*---[^\S\n]*\n.*?^[^\S\n]*---[^\S\n]*(?:\n|\Z)', re.MULTILINE | re.DOTALL)
+_BLANK_LINE_RE = re.compile(rb'[^\S\n]*\n')
+
+# Memoized: the same stems and link targets recur across notes and index files
+@lru_cache(maxsize=None)
 def _normalize_text_for_linking(text: str) -> str:
-    """Converts text to lowercase and replaces non-alphanumeric chars with spaces."""
+    """Converts text to lowercase and replaces non-alphanumeric chars with spaces.
+
+    The result is interned, since normalized names are the keys of every note/link set comparison.
+    """
     # Convert to lowercase
     text = text.lower()
+    if text.isascii():
+        # Fast path: a table-driven bytes.translate, then split/join collapses runs of spaces and strips the ends
+        translated = text.encode('ascii').translate(_ASCII_NON_ALNUM_TO_SPACE)
+        return sys.intern(b' '.join(translated.split()).decode('ascii'))
+    # Non-ASCII characters are non-alphanumeric too, which the translate table does not cover.
     # Replace non-alphanumeric characters (and sequences of them) with a single space
-    text = re.sub(r'[^a-z0-9]+', ' ', text)
-    # Strip leading/trailing spaces that might result from the replacement
-    return text.strip()
+    text = _NON_ALNUM_RE.sub(' ', text)
+    # Strip leading/trailing spaces that might result from the replacement.
+    return sys.intern(text.strip())
+
+_UNINDEXED_SENTINEL = _normalize_text_for_linking("unindexed")
+
+@lru_cache(maxsize=4)
+def _load_config_cached(config_file: Path, mtime_ns: int) -> dict:
+    """Parses the config file; keyed on its mtime so an edited file is parsed again."""
+    config_bytes = config_file.read_bytes()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can handle both parsers alike
+    return orjson.loads(config_bytes) if orjson else json.loads(config_bytes)
 
 def load_zettelkasten_path() -> Path | None:
     """Loads the Zettelkasten folder path from config.json."""
     try:
-        if not CONFIG_FILE.exists():
+        try:
+            config_mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+        except FileNotFoundError:
             logger.error(f"Configuration file not found: {CONFIG_FILE}")
             return None
-        with open(CONFIG_FILE, "r") as f:
-            config_data = json.load(f)
+        config_data = _load_config_cached(CONFIG_FILE, config_mtime_ns)
         zettelkasten_path_str = config_data.get("zettelkasten_folder_path")
         if not zettelkasten_path_str:
             logger.error(f"'zettelkasten_folder_path' not found in {CONFIG_FILE}")
@@ -47,87 +97,155 @@ def load_zettelkasten_path() -> Path | None:
         logger.error(f"An unexpected error occurred while loading config: {e}")
         return None
 
-def list_md_files_in_zettelkasten(zettelkasten_path: Path) -> list[Path]:
-    """Lists all .md files in the Zettelkasten folder (non-recursive)."""
+@lru_cache(maxsize=None)
+def _tag_regex(tag: str) -> re.Pattern[bytes]:
+    """Compiles a bytes pattern matching the tag as a whole tag, not as a prefix like '#indexed'."""
+    tag_bytes = re.escape(tag.encode('utf-8'))
+    # Leading with the literal keeps the regex engine's fast prefix scan; the lookbehind then checks what precedes it.
+    # Bytes-mode \w and \s are ASCII-only, so UTF-8 lead/continuation bytes are listed explicitly as tag characters
+    # ('#indexé' is another tag); \S already counts them as non-space, so a non-ASCII character before '#' also rejects.
+    return re.compile(tag_bytes + rb'(?<!\S' + tag_bytes + rb')(?![\w/\x80-\xff-])')
+
+def _load_state(state_file: Path) -> dict:
+    """Loads a JSON state file, returning an empty dict if it is missing, unreadable or not a JSON object."""
+    try:
+        state = json.loads(state_file.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Could not load state from {state_file}: {e}. Starting with empty state.")
+        return {}
+    if not isinstance(state, dict):
+        logger.warning(f"State in {state_file} is not a JSON object. Starting with empty state.")
+        return {}
+    return state
+
+def _save_state(state_file: Path, state: dict):
+    """Persists a state dict as JSON (removing the file when the state is empty), logging (not raising) on failure."""
+    try:
+        if not state:
+            state_file.unlink(missing_ok=True)
+            return
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        state_file.write_text(json.dumps(state), encoding='utf-8')
+    except Exception as e:
+        logger.warning(f"Could not save state to {state_file}: {e}")
+
+def list_md_files_in_zettelkasten(zettelkasten_path: Path) -> Iterator[os.DirEntry]:
+    """Lazily yields all .md files in the Zettelkasten folder (non-recursive) as os.DirEntry records."""
     if not zettelkasten_path or not zettelkasten_path.is_dir():
         logger.error(f"Invalid Zettelkasten path provided: {zettelkasten_path}")
-        return []
+        return
 
-    md_files = []
     try:
-        for item in zettelkasten_path.iterdir():
-            if item.is_file() and item.suffix.lower() == ".md":
-                md_files.append(item)
-        
-        if not md_files:
-            logger.info(f"No .md files found in {zettelkasten_path}")
-        else:
-            logger.info(f"Found {len(md_files)} .md file(s) in {zettelkasten_path}")
-        return md_files
-    except Exception as e:
+        # os.scandir exposes the d_type from readdir, so is_file() only needs a stat() for symlinks
+        with os.scandir(zettelkasten_path) as entries:
+            for entry in entries:
+                name = entry.name
+                # A bare ".md" has no stem (Path.suffix treats it as a dotfile), so it is not a note
+                if len(name) > 3 and name.lower().endswith(".md") and entry.is_file():
+                    yield entry
+    except OSError as e:
         logger.error(f"Error listing .md files in {zettelkasten_path}: {e}")
-        return []
-
-def extract_wikilinks_from_content(content_str: str) -> set[str]:
-    """Extracts all unique, normalized wikilinks from a string of markdown content."""
-    # Regex to find [[wikilinks]]
-    # It captures the content inside the brackets
-    wikilink_pattern = r'\[\[([^\]]+)\]\]'
-    found_links = re.findall(wikilink_pattern, content_str)
-    
-    normalized_links = set()
-    for link_target in found_links:
-        # Normalize the link target using the new common normalization function
-        normalized_links.add(_normalize_text_for_linking(link_target.strip()))
-        
-    return normalized_links
+        raise  # Callers must not carry on with a partial listing
 
 # --- Refactored Helper Functions ---
 
-def _collect_note_and_index_data(md_files: list[Path]) -> tuple[dict[str, str], list[Path], set[str]]:
+def _collect_note_and_index_data(md_files: Iterable[os.DirEntry]) -> tuple[dict[str, str], list[Path], set[str]]:
     """Collects all note data, identifies index files, and returns normalized note names."""
     all_notes_data: dict[str, str] = {}
     index_file_paths: list[Path] = []
+    md_file_count = 0  # Counted here since md_files may be a one-shot iterator
 
+    # Work on the plain DirEntry name strings; only index files are lifted to Path for later phases
     for f in md_files:
-        original_stem = f.stem  # e.g., "My Note Title"
+        md_file_count += 1
+        name = f.name
+        original_stem = name[:-3]  # e.g., "My Note Title"; listing already guaranteed a non-empty stem and the .md suffix
         normalized_name = _normalize_text_for_linking(original_stem)  # e.g., "my note title"
-        
-        if normalized_name in all_notes_data:
-            logger.warning(f"Duplicate normalized note name '{normalized_name}' detected. Original stems: '{all_notes_data[normalized_name]}' and '{original_stem}'. Using the first one encountered: '{all_notes_data[normalized_name]}'.")
-        else:
-            all_notes_data[normalized_name] = original_stem
-
-        if f.name.lower().endswith("index.md"):
-            index_file_paths.append(f)
+        if normalized_name == _UNINDEXED_SENTINEL:
+            continue  # unindexed.md itself is never a note, so it is left out here rather than removed later
+
+        # setdefault does the check-then-insert with a single hash lookup; a dict that did not grow means a duplicate
+        notes_seen = len(all_notes_data)
+        first_stem = all_notes_data.setdefault(normalized_name, original_stem)
+        if len(all_notes_data) == notes_seen:
+            logger.warning(f"Duplicate normalized note name '{normalized_name}' detected. Original stems: '{first_stem}' and '{original_stem}'. Using the first one encountered: '{first_stem}'.")
+
+        # Lowercase only the 8-character tail rather than a copy of the whole filename
+        if name[-8:].lower() == "index.md":
+            index_file_paths.append(Path(f.path))
             
     all_normalized_note_names_set = set(all_notes_data.keys())
     
+    logger.info(f"Found {md_file_count} .md file(s).")
     logger.info(f"Found {len(all_normalized_note_names_set)} unique normalized note name(s).")
-    logger.debug(f"All notes data (normalized -> original stem): {all_notes_data}")
+    logger.debug("All notes data (normalized -> original stem): {}", all_notes_data)
     logger.info(f"Found {len(index_file_paths)} index file(s): {[f.name for f in index_file_paths]}")
     
     return all_notes_data, index_file_paths, all_normalized_note_names_set
 
-def _extract_all_wikilinks_from_indices(index_file_paths: list[Path]) -> set[str]:
-    """Extracts all unique, normalized wikilinks from a list of index files."""
-    notes_linked_from_indices: set[str] = set()
+def _read_index_file(index_file_path: Path, allow_mmap: bool = True) -> tuple[os.stat_result, bytes | mmap.mmap] | None:
+    """Reads the raw bytes of an index file (memory-mapped if large) with its stat, logging and returning None on failure."""
+    try:
+        # Unbuffered: FileIO.readall sizes its buffer from fstat, so no 8 KiB BufferedReader is allocated in between
+        with index_file_path.open("rb", buffering=0) as f:
+            # Taken before reading, so a change made during the read shows up as a newer mtime later
+            file_stat = os.fstat(f.fileno())
+            if allow_mmap and file_stat.st_size >= MMAP_MIN_SIZE:
+                try:
+                    return file_stat, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError) as e:  # Some FUSE/network filesystems cannot be mapped
+                    logger.debug("Could not mmap {} ({}). Reading it instead.", index_file_path.name, e)
+            return file_stat, f.read()
+    except Exception as e:
+        logger.error(f"Error reading index file {index_file_path.name}: {e}")
+        return None
+
+def _read_index_files(index_file_paths: list[Path], allow_mmap: bool = True) -> list[tuple[os.stat_result, bytes | mmap.mmap] | None]:
+    """Reads index files concurrently; the GIL is released while each read blocks on I/O."""
+    if len(index_file_paths) <= 1:  # Not worth spinning up a pool
+        return [_read_index_file(path, allow_mmap) for path in index_file_paths]
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(index_file_paths))) as executor:
+        return list(executor.map(_read_index_file, index_file_paths, [allow_mmap] * len(index_file_paths)))
+
+def _extract_all_wikilinks_from_indices(index_file_paths: list[Path]) -> tuple[set[str], dict[Path, tuple[int, int, bytes]]]:
+    """Extracts all unique, normalized wikilinks from a list of index files, plus the raw contents read.
+
+    Contents are keyed by path as (st_mtime_ns, st_size, bytes), so later phases can tell whether they are still current.
+    """
+    index_contents: dict[Path, tuple[int, int, bytes]] = {}
     if not index_file_paths:
         logger.info("No index files found to process for links.")
-        return notes_linked_from_indices
-
-    for index_file_path in index_file_paths:
+        return set(), index_contents
+
+    # Raw link targets from every file, decoded and normalized once at the end
+    raw_link_targets: set[bytes] = set()
+
+    for index_file_path, read_result in zip(index_file_paths, _read_index_files(index_file_paths)):
+        if read_result is None:
+            continue
+        file_stat, content = read_result
+        if isinstance(content, bytes):
+            # Large mapped files are re-read by later phases instead
+            index_contents[index_file_path] = (file_stat.st_mtime_ns, file_stat.st_size, content)
         try:
-            content = index_file_path.read_text(encoding='utf-8')
-            linked_notes = extract_wikilinks_from_content(content)
-            logger.debug(f"Links found in {index_file_path.name}: {linked_notes}")
-            notes_linked_from_indices.update(linked_notes)
+            file_link_targets = _WIKILINK_RE_BYTES.findall(content)
+            logger.debug("Links found in {}: {}", index_file_path.name, file_link_targets)
+            raw_link_targets.update(file_link_targets)
         except Exception as e:
-            logger.error(f"Error reading or processing index file {index_file_path.name}: {e}")
-            
+            logger.error(f"Error processing index file {index_file_path.name}: {e}")
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
+
+    notes_linked_from_indices = {
+        _normalize_text_for_linking(link_target.decode('utf-8', 'replace').strip())
+        for link_target in raw_link_targets
+    }
     logger.info(f"Found {len(notes_linked_from_indices)} unique notes linked from all index files.")
-    logger.debug(f"All notes linked from indices (normalized): {notes_linked_from_indices}")
-    return notes_linked_from_indices
+    logger.debug("All notes linked from indices (normalized): {}", notes_linked_from_indices)
+    return notes_linked_from_indices, index_contents
 
 def _determine_unindexed_notes(all_normalized_note_names: set[str], linked_notes_normalized: set[str]) -> set[str]:
     """Determines the set of normalized note names that are unindexed."""
@@ -136,57 +254,53 @@ def _determine_unindexed_notes(all_normalized_note_names: set[str], linked_notes
         return set()
         
     notes_for_unindexed_md = all_normalized_note_names - linked_notes_normalized
-    logger.info(f"{len(notes_for_unindexed_md)} candidate(s) for unindexed.md before filtering 'unindexed' itself.")
-
-    normalized_unindexed_filename = _normalize_text_for_linking("unindexed")
-    if normalized_unindexed_filename in notes_for_unindexed_md:
-        notes_for_unindexed_md.remove(normalized_unindexed_filename)
-        logger.info(f"Removed '{normalized_unindexed_filename}' (normalized 'unindexed') from the list of notes for unindexed.md.")
-    
     logger.info(f"{len(notes_for_unindexed_md)} note(s) determined to be unindexed.")
     return notes_for_unindexed_md
 
-def _parse_existing_unindexed_file(current_unindexed_normalized: set[str]) -> tuple[list[str], set[str]]:
-    """Reads existing unindexed.md, preserves relevant lines and non-note content."""
-    preserved_lines: list[str] = []
+def _parse_existing_unindexed_file(unindexed_md_file: Path, current_unindexed_normalized: set[str]) -> set[str]:
+    """Reads existing unindexed.md and returns the still-unindexed notes it already lists."""
     kept_normalized_notes: set[str] = set()
 
-    existing_lines = ""
-    for line_num, line_content in enumerate(existing_lines):
-        match = re.fullmatch(r'\s*\[\[\s*([^]]+?)\s*\]\]\s*', line_content)
-        if match:
-            original_text_in_link = match.group(1).strip()
-            note_name_in_line_normalized = _normalize_text_for_linking(original_text_in_link)
-            
-            if note_name_in_line_normalized in current_unindexed_normalized:
-                preserved_lines.append(line_content)
-                kept_normalized_notes.add(note_name_in_line_normalized)
-        else:
-            preserved_lines.append(line_content)
+    try:
+        existing_bytes = unindexed_md_file.read_bytes()
+    except FileNotFoundError:
+        logger.debug(f"{unindexed_md_file.name} does not exist yet. No notes listed in it to keep.")
+        existing_bytes = b""
+    except Exception as e:
+        logger.error(f"Error reading {unindexed_md_file.name}: {e}")
+        existing_bytes = b""
+
+    # One findall over the raw bytes; only the distinct link targets are decoded and normalized
+    for raw_target in set(_UNINDEXED_LINE_RE.findall(existing_bytes)):
+        note_name_in_line_normalized = _normalize_text_for_linking(raw_target.decode('utf-8', 'replace'))
+        if note_name_in_line_normalized in current_unindexed_normalized:
+            kept_normalized_notes.add(note_name_in_line_normalized)
     
-    return preserved_lines, kept_normalized_notes
+    return kept_normalized_notes
 
 def _prepare_final_unindexed_content(
-    preserved_lines: list[str],
     kept_normalized_notes: set[str],
     current_unindexed_normalized: set[str],
     all_notes_data: dict[str, str]
 ) -> list[str]:
     """Prepares the final list of lines for unindexed.md, adding new notes, and returns added lines."""
-    added_lines_content: list[str] = []
-
-    newly_unindexed_to_add_normalized = sorted(list(current_unindexed_normalized - kept_normalized_notes))
-
-    if newly_unindexed_to_add_normalized:
-        logger.info(f"Adding {len(newly_unindexed_to_add_normalized)} new unindexed note(s).")
-        for normalized_note_name_to_add in newly_unindexed_to_add_normalized:
-            original_stem_to_link = all_notes_data.get(normalized_note_name_to_add)
-            if original_stem_to_link:
-                new_line_to_add = f"[[{original_stem_to_link}]]"
-                added_lines_content.append(new_line_to_add)
-                logger.debug(f"Appending new unindexed note (normalized: '{normalized_note_name_to_add}', original: '{original_stem_to_link}') to content: {new_line_to_add}")
-            else:
-                logger.error(f"Could not find original stem for normalized note name '{normalized_note_name_to_add}'. Skipping addition.")
+    newly_unindexed_to_add_normalized = sorted(current_unindexed_normalized - kept_normalized_notes)
+    if not newly_unindexed_to_add_normalized:
+        return []
+
+    logger.info(f"Adding {len(newly_unindexed_to_add_normalized)} new unindexed note(s).")
+    get_original_stem = all_notes_data.get  # Bound once rather than looked up per note
+    added_lines_content = [
+        f"[[{original_stem}]]"
+        for normalized_note_name in newly_unindexed_to_add_normalized
+        if (original_stem := get_original_stem(normalized_note_name))
+    ]
+    if len(added_lines_content) != len(newly_unindexed_to_add_normalized):
+        for normalized_note_name in newly_unindexed_to_add_normalized:
+            if not get_original_stem(normalized_note_name):
+                logger.error(f"Could not find original stem for normalized note name '{normalized_note_name}'. Skipping addition.")
+    # Positional args are only formatted by loguru if a DEBUG sink will emit the message
+    logger.debug("Appending new unindexed notes to content: {}", added_lines_content)
 
     return added_lines_content
 
@@ -196,39 +310,31 @@ def _append_lines_to_file(file_path: Path, lines_to_append: list[str]):
         logger.debug(f"No lines to append to {file_path}. Skipping.")
         return
 
-    num_newlines_to_prefix = 0
-    if file_path.exists() and file_path.stat().st_size > 0:
+    try:
+        file_size = file_path.stat().st_size
+    except FileNotFoundError:
+        file_size = 0
+
+    num_newlines_to_prefix = 2  # File does not exist, is empty, or does not end with a newline
+    if file_size > 0:
         try:
-            with file_path.open("rb") as f:  # Open in binary for seek and read last bytes
-                f.seek(0, 2)  # Go to end of file
-                file_size = f.tell()
-                read_size = min(2, file_size) # Read at most last 2 bytes
-                
-                content_ends_with = "" # Default if file is too small or only contains partial char
-                if read_size > 0:
-                    f.seek(file_size - read_size)
-                    last_bytes = f.read(read_size)
-                    content_ends_with = last_bytes.decode("utf-8", errors="ignore")
-
-                if content_ends_with.endswith("\n\n"):
-                    num_newlines_to_prefix = 0
-                elif content_ends_with.endswith("\n"):
-                    num_newlines_to_prefix = 1
-                else:  # Does not end with any newline, or file was smaller than 1 char
-                    num_newlines_to_prefix = 2
+            with file_path.open("rb") as f:  # Open in binary to read just the last bytes
+                f.seek(max(0, file_size - 2))
+                content_ends_with = f.read(2).decode("utf-8", errors="ignore")
+
+            if content_ends_with.endswith("\n\n"):
+                num_newlines_to_prefix = 0
+            elif content_ends_with.endswith("\n"):
+                num_newlines_to_prefix = 1
         except Exception as e:
             logger.warning(f"Could not read end of file {file_path} to check newlines: {e}. Assuming 2 prefix newlines needed.")
             num_newlines_to_prefix = 2 # Fallback on error
-    else:  # File does not exist or is empty
-        num_newlines_to_prefix = 2
 
     try:
+        # Each new item on its own line, joined up front so the file sees a single write
+        payload = "\n" * num_newlines_to_prefix + "\n".join(lines_to_append) + "\n"
         with file_path.open("a", encoding="utf-8") as f:
-            if num_newlines_to_prefix > 0:
-                f.write("\n" * num_newlines_to_prefix)
-            
-            for line in lines_to_append:
-                f.write(line + "\n")  # Each new item on a new line
+            f.write(payload)
         logger.info(f"Appended {len(lines_to_append)} lines to {file_path} (prefixed with {num_newlines_to_prefix} newline(s) if needed).")
     except IOError as e:
         logger.error(f"Error appending to {file_path}: {e}")
@@ -237,72 +343,138 @@ def _append_lines_to_file(file_path: Path, lines_to_append: list[str]):
 def _update_unindexed_md_file(unindexed_md_path: Path, current_unindexed_normalized: set[str], all_notes_data: dict[str, str]):
     """Coordinates the update of the unindexed.md file and appends additions to temp index.md."""
 
-    preserved_lines, kept_normalized_notes = \
-        _parse_existing_unindexed_file(current_unindexed_normalized)
+    kept_normalized_notes = _parse_existing_unindexed_file(unindexed_md_path / "unindexed.md", current_unindexed_normalized)
 
     newly_added_lines_for_temp_md = \
-        _prepare_final_unindexed_content(preserved_lines, kept_normalized_notes, current_unindexed_normalized, all_notes_data)
+        _prepare_final_unindexed_content(kept_normalized_notes, current_unindexed_normalized, all_notes_data)
 
     if newly_added_lines_for_temp_md: # Check if there are any lines to append
-        temp_md_path = unindexed_md_path / "temp index.md"
+        temp_md_path = unindexed_md_path / TEMP_INDEX_FILENAME
         _append_lines_to_file(temp_md_path, newly_added_lines_for_temp_md)
 
 
-def _ensure_index_file_tags(index_file_paths: list[Path], tag_to_ensure: str = "#index"):
-    """Ensures all specified index files contain the given tag."""
+def _write_bytes_atomic(file_path: Path, data: bytes):
+    """Replaces a file's contents via a sibling temp file and os.replace, so readers never see a partial write."""
+    target = file_path.resolve()  # Rewrite a symlinked note's target rather than replacing the link
+    # A fresh, uniquely named sibling, so no existing file in the vault is ever clobbered; not .md, so never listed
+    tmp_fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f"{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(tmp_fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())  # The data must be on disk before the rename makes it the file's contents
+        os.chmod(tmp_name, target.stat().st_mode & 0o7777)
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+def _ensure_index_file_tags(
+    index_file_paths: list[Path],
+    tag_to_ensure: str = "#index",
+    index_contents: dict[Path, tuple[int, int, bytes]] | None = None
+):
+    """Ensures all specified index files contain the given tag, reusing already-read contents that are still current."""
     if not index_file_paths:
         logger.info("No index files found to tag.")
         return
 
     logger.info(f"Starting Phase: Tagging index files with '{tag_to_ensure}'.")
+    tag_bytes = tag_to_ensure.encode('utf-8')
+    tag_regex = _tag_regex(tag_to_ensure)
+    # Checking bytes already in memory is cheaper than any state lookup, so the state file only covers
+    # files that have to be read from disk (large mmapped ones); without any, it is removed, leaving one failed open
+    tag_state = _load_state(TAG_STATE_FILE)
+    previously_verified = tag_state.get(tag_to_ensure)
+    if not isinstance(previously_verified, dict):
+        previously_verified = {}
+    # Rebuilt from this run's files, so entries for renamed or deleted index files are dropped.
+    # Files whose [st_mtime_ns, st_size] match the last verification are known to carry the tag already.
+    verified_files: dict[str, list[int]] = {}
+
+    index_contents = index_contents or {}
+    # (path, raw bytes) per file to check; bytes are None until read below
+    files_to_check: list[tuple[Path, bytes | None]] = []
     for index_file_path in index_file_paths:
         try:
-            original_content = index_file_path.read_text(encoding='utf-8')
-            if tag_to_ensure not in original_content:
-                logger.info(f"Tagging {index_file_path.name} with {tag_to_ensure}.")
-                
-                content_lines = original_content.splitlines(True) # Keep line endings
-                frontmatter_end_line_index = -1
-                if content_lines and content_lines[0].strip() == "---":
-                    for i, line in enumerate(content_lines[1:], start=1):
-                        if line.strip() == "---":
-                            frontmatter_end_line_index = i
-                            break
-                
-                processed_lines = []
-                # Ensure tag has a newline if it's not the only content or part of frontmatter
-                tag_line = f"{tag_to_ensure}\n"
-
-                if frontmatter_end_line_index != -1:
-                    processed_lines.extend(content_lines[:frontmatter_end_line_index + 1])
-                    # Check if line after frontmatter is blank, if so, can use it
-                    if frontmatter_end_line_index + 1 < len(content_lines) and content_lines[frontmatter_end_line_index + 1].strip() == "":
-                        processed_lines.append(tag_line) # Add tag
-                        processed_lines.extend(content_lines[frontmatter_end_line_index + 2:]) # Skip the blank line
-                    else:
-                        processed_lines.append(tag_line) # Add tag
-                        if frontmatter_end_line_index + 1 < len(content_lines):
-                             processed_lines.extend(content_lines[frontmatter_end_line_index + 1:])
-                else:
-                    # No valid frontmatter. Add tag, then a blank line if content exists, then content.
-                    processed_lines.append(tag_line)
-                    if content_lines and content_lines[0].strip() != "": # If first line had content
-                        if not content_lines[0].startswith("\n") and tag_line.endswith("\n") : # ensure separation if needed
-                             pass # tag_line already ends with \n
-                    processed_lines.extend(content_lines)
-                
-                new_content_str = "".join(processed_lines).rstrip() + "\n" # Ensure single trailing newline
-
-                if new_content_str != original_content:
-                    index_file_path.write_text(new_content_str, encoding='utf-8')
-                    logger.info(f"Successfully tagged {index_file_path.name}.")
-                else:
-                    logger.debug(f"Content for {index_file_path.name} with {tag_to_ensure} tag resulted in no effective change. Skipping write.")
+            file_stat = index_file_path.stat()
+        except Exception as e:
+            logger.error(f"Error checking index file {index_file_path.name}: {e}")
+            continue
+        # Earlier bytes are only used while the file still has the mtime and size they were read at;
+        # anything changed since (such as temp index.md appended to in Phase 3) is read again
+        cached = index_contents.get(index_file_path)
+        if cached is not None and cached[:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+            files_to_check.append((index_file_path, cached[2]))
+            continue
+
+        state_key = str(index_file_path)
+        file_signature = [file_stat.st_mtime_ns, file_stat.st_size]
+        if previously_verified.get(state_key) == file_signature:
+            verified_files[state_key] = file_signature
+            logger.debug("{} is unchanged since it was last verified. Skipping.", index_file_path.name)
+            continue
+        files_to_check.append((index_file_path, None))
+
+    # Read, concurrently, whatever is not current in memory
+    paths_to_read = [path for path, raw_content in files_to_check if raw_content is None]
+    fresh_reads = dict(zip(paths_to_read, _read_index_files(paths_to_read, allow_mmap=False)))
+
+    for index_file_path, raw_content in files_to_check:
+        read_from_disk = raw_content is None  # Only these files are tracked in the state file
+        if read_from_disk:
+            read_result = fresh_reads[index_file_path]
+            if read_result is None:
+                continue  # The read error has already been logged
+            file_stat, raw_content = read_result
+        try:
+            state_key = str(index_file_path)
+            # Already-tagged files (the steady state) are settled without decoding them
+            if tag_bytes in raw_content and tag_regex.search(raw_content):
+                logger.debug("{} already contains the {} tag.", index_file_path.name, tag_to_ensure)
+                if read_from_disk:
+                    verified_files[state_key] = [file_stat.st_mtime_ns, file_stat.st_size]
+                continue
+
+            logger.info(f"Tagging {index_file_path.name} with {tag_to_ensure}.")
+            
+            # Work on the raw bytes throughout, matching the file's own line endings; nothing is decoded or re-encoded
+            first_newline = raw_content.find(b"\n")
+            newline = b"\r\n" if first_newline > 0 and raw_content[first_newline - 1] == ord("\r") else b"\n"
+            tag_line = tag_bytes + newline
+
+            # Splice the tag in by offset rather than splitting the whole file into lines
+            insert_at = resume_at = 0
+            frontmatter_match = _FRONTMATTER_RE.match(raw_content)
+            if frontmatter_match:
+                insert_at = resume_at = frontmatter_match.end()
+                # If the line after frontmatter is blank, the tag takes its place
+                blank_line_match = _BLANK_LINE_RE.match(raw_content, insert_at)
+                if blank_line_match:
+                    resume_at = blank_line_match.end()
+                if not raw_content.endswith(b"\n", 0, insert_at): # Frontmatter closes at end of file
+                    tag_line = newline + tag_line
+
+            new_content = raw_content[:insert_at] + tag_line + raw_content[resume_at:]
+            new_content = new_content.rstrip() + newline # Ensure single trailing newline
+
+            if new_content != raw_content:
+                _write_bytes_atomic(index_file_path, new_content)
+                logger.info(f"Successfully tagged {index_file_path.name}.")
+                if read_from_disk:
+                    written_stat = index_file_path.stat()
+                    verified_files[state_key] = [written_stat.st_mtime_ns, written_stat.st_size]
             else:
-                logger.debug(f"{index_file_path.name} already contains the {tag_to_ensure} tag.")
+                logger.debug("Content for {} with {} tag resulted in no effective change. Skipping write.", index_file_path.name, tag_to_ensure)
         except Exception as e:
             logger.error(f"Error processing or tagging index file {index_file_path.name}: {e}")
 
+    if verified_files != previously_verified:
+        if verified_files:
+            tag_state[tag_to_ensure] = verified_files
+        else:
+            tag_state.pop(tag_to_ensure, None)
+        _save_state(TAG_STATE_FILE, tag_state)
 
 def main():
     zk_path = load_zettelkasten_path()
@@ -310,23 +482,23 @@ def main():
         logger.error("Failed to load Zettelkasten path. Exiting.")
         return
 
-    md_files = list_md_files_in_zettelkasten(zk_path)
-    if not md_files:
-        logger.info("No .md files found in the Zettelkasten. Skipping further processing.")
-        return
-
     logger.info(f"Proceeding with Zettelkasten at: {zk_path}")
 
-    # Phase 1: Collect all note data and identify index files
+    # Phase 1: Collect all note data and identify index files, consuming the directory listing as it is scanned
     logger.info("Starting Phase 1: Collecting note and index data.")
-    all_notes_data, index_file_paths, all_normalized_note_names_set = _collect_note_and_index_data(md_files)
+    try:
+        all_notes_data, index_file_paths, all_normalized_note_names_set = \
+            _collect_note_and_index_data(list_md_files_in_zettelkasten(zk_path))
+    except OSError:  # Only listing failures; a bug in collection itself should surface with its traceback
+        logger.error("Failed to list .md files in the Zettelkasten. Exiting.")
+        return
     if not all_normalized_note_names_set:
-        logger.info("No processable notes found after initial collection. Exiting.")
+        logger.info("No .md files found in the Zettelkasten. Skipping further processing.")
         return
 
     # Phase 2: Extract all links from index files
     logger.info("Starting Phase 2: Extracting links from index files.")
-    notes_linked_from_indices_normalized = _extract_all_wikilinks_from_indices(index_file_paths)
+    notes_linked_from_indices_normalized, index_contents = _extract_all_wikilinks_from_indices(index_file_paths)
 
     # Phase 3: Determine unindexed notes and update unindexed.md
     logger.info("Starting Phase 3: Determining unindexed notes and updating unindexed.md.")
@@ -336,7 +508,7 @@ def main():
 
     # Phase 4: Ensure index files are tagged
     logger.info("Starting Phase 4: Tagging index files.") # Log for this phase was in _ensure_index_file_tags
-    _ensure_index_file_tags(index_file_paths) # Default tag is "#index"
+    _ensure_index_file_tags(index_file_paths, index_contents=index_contents) # Default tag is "#index"
 
     logger.info("Zettelkasten Indexer Script finished successfully.")
 
@@ -344,6 +516,7 @@ def main():
 if __name__ == "__main__":
     # Initialize logger
     logger.remove() # Remove default handler
-    logger.add(lambda msg: print(msg, end=''), format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}") # Basic console logger
+    # Write straight to stderr: no Python sink call per record, and debug records are rejected before formatting
+    logger.add(sys.stderr, format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}", level="INFO", colorize=False) # Basic console logger
     logger.info("Starting Zettelkasten Indexer Script")
     main()